@@ -3,7 +3,9 @@ SQLite database module for Simple Photo Meta.
 Simple raw SQL queries - no ORM.
 """
 
+import os
 import sqlite3
+import functools
 import threading
 from pathlib import Path
 from typing import Optional
@@ -15,15 +17,81 @@ from config import DATABASE_PATH
 # Thread-local storage for connections
 _local = threading.local()
 
+# Statements run on the save and scan paths. sqlite3 caches prepared
+# statements per connection keyed by SQL text, so every caller shares one
+# fixed string (and no placeholder lists that vary with the row count).
+_SELECT_TAG_ID_SQL = "SELECT id FROM tags WHERE tag = ? AND tag_type = ?"
+_INSERT_TAG_SQL = "INSERT OR IGNORE INTO tags (tag, tag_type) VALUES (?, ?)"
+_SELECT_IMAGE_ID_SQL = "SELECT id FROM images WHERE path = ?"
+_INSERT_IMAGE_SQL = "INSERT OR IGNORE INTO images (path) VALUES (?)"
+_UPSERT_IMAGE_MTIME_SQL = """
+    INSERT INTO images (path, mtime) VALUES (?, ?)
+    ON CONFLICT(path) DO UPDATE SET mtime = excluded.mtime
+"""
+_INSERT_IMAGE_TAG_SQL = "INSERT OR IGNORE INTO image_tags (image_id, tag_id) VALUES (?, ?)"
+
 
 def get_connection() -> sqlite3.Connection:
     """Get a thread-local database connection."""
     if not hasattr(_local, 'connection') or _local.connection is None:
-        _local.connection = sqlite3.connect(str(DATABASE_PATH), check_same_thread=False)
-        _local.connection.row_factory = sqlite3.Row
+        # Room for every distinct statement the app runs (search builds a
+        # few shapes per word count), so none are evicted and re-prepared.
+        # Each thread has its own connection, so under WAL reads never wait
+        # on a write; only writers (a save during a scan, or a checkpoint)
+        # contend, and they wait up to 30s for the lock rather than failing
+        # with "database is locked" after sqlite3's default 5s. The API runs
+        # its queries via asyncio.to_thread, so that wait never stalls the
+        # event loop.
+        conn = sqlite3.connect(
+            str(DATABASE_PATH), timeout=30, check_same_thread=False, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL with synchronous=NORMAL: commits append to the WAL without an
+        # fsync each time. The database stays consistent after a crash, but
+        # the last few commits before a power loss may be lost - fine for an
+        # index that can be rebuilt by rescanning.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-20000")
+        _local.connection = conn
     return _local.connection
 
 
+def close_connection():
+    """Close this thread's database connection, if it has one.
+    
+    Connections live for the life of their thread and are reused by every
+    call on it. Short-lived worker threads (e.g. a scan) call this when done
+    so the connection is released at once rather than whenever the thread's
+    locals are collected.
+    """
+    conn = getattr(_local, 'connection', None)
+    if conn is not None:
+        conn.close()
+        _local.connection = None
+
+
+def checkpoint():
+    """Fold the write-ahead log back into the database file.
+    
+    PASSIVE: copies what it can without waiting on, or blocking, readers
+    and writers on other connections. Used after bulk writes such as a scan,
+    so the WAL doesn't stay large until the next auto-checkpoint.
+    """
+    get_connection().execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+
+def optimize():
+    """Let SQLite refresh its query planner statistics where they are stale.
+    
+    Cheap when nothing changed much. Used after bulk writes such as a scan,
+    so the planner sees the new row counts when choosing indexes.
+    """
+    get_connection().execute("PRAGMA optimize")
+
+
 @contextmanager
 def get_cursor():
     """Context manager for database cursor."""
@@ -56,10 +124,17 @@ def init_database():
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS images (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                path TEXT NOT NULL UNIQUE
+                path TEXT NOT NULL UNIQUE,
+                mtime REAL
             )
         """)
         
+        # Databases created before mtime was recorded get the column added;
+        # their rows keep a NULL mtime until the image is next read
+        columns = {row['name'] for row in cursor.execute("PRAGMA table_info(images)")}
+        if 'mtime' not in columns:
+            cursor.execute("ALTER TABLE images ADD COLUMN mtime REAL")
+        
         # Image-Tag associations
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS image_tags (
@@ -89,77 +164,40 @@ def init_database():
             )
         """)
         
-        # Create indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_images_path ON images(path)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_type ON tags(tag_type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag)")
+        # Create indexes. images.path and tags(tag, tag_type) are already
+        # indexed by their UNIQUE constraints; image_tags needs one led by
+        # tag_id for joins driven from tags (search, tagged-image lookups).
+        # It also carries image_id, so those joins never visit the table.
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_image_tags_tag_image ON image_tags(tag_id, image_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_type_tag ON tags(tag_type, tag)")
+        # Folder filters on case-insensitive volumes compare paths with NOCASE
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_images_path_nocase ON images(path COLLATE NOCASE)")
+        
+        # Superseded indexes that duplicated or were covered by the ones above
+        cursor.execute("DROP INDEX IF EXISTS idx_image_tags_tag_id")
+        cursor.execute("DROP INDEX IF EXISTS idx_images_path")
+        cursor.execute("DROP INDEX IF EXISTS idx_tags_type")
+        cursor.execute("DROP INDEX IF EXISTS idx_tags_tag")
 
 
 # ============== Tag operations ==============
 
-def get_or_create_tag(tag: str, tag_type: str) -> int:
-    """Get or create a tag, return its ID."""
-    with get_cursor() as cursor:
-        cursor.execute(
-            "SELECT id FROM tags WHERE tag = ? AND tag_type = ?",
-            (tag, tag_type)
-        )
-        row = cursor.fetchone()
-        if row:
-            return row['id']
-        
-        cursor.execute(
-            "INSERT INTO tags (tag, tag_type) VALUES (?, ?)",
-            (tag, tag_type)
-        )
-        return cursor.lastrowid
+def _get_or_create_tag_ids(cursor: sqlite3.Cursor, tags: list[str], tag_type: str) -> list[int]:
+    """Get or create several tags of one type in bulk, return their IDs."""
+    cursor.executemany(_INSERT_TAG_SQL, [(tag, tag_type) for tag in tags])
+    # One cached point lookup per tag on the (tag, tag_type) unique index
+    return [cursor.execute(_SELECT_TAG_ID_SQL, (tag, tag_type)).fetchone()['id'] for tag in tags]
 
 
-def get_tags_by_type(tag_type: Optional[str] = None) -> list[str]:
-    """Get all unique tags, optionally filtered by type."""
+def get_all_tags() -> list[tuple[str, str]]:
+    """Get every (tag, tag_type) pair, ordered by tag."""
     with get_cursor() as cursor:
-        if tag_type:
-            cursor.execute(
-                "SELECT DISTINCT tag FROM tags WHERE tag_type = ? ORDER BY tag",
-                (tag_type,)
-            )
-        else:
-            cursor.execute("SELECT DISTINCT tag FROM tags ORDER BY tag")
-        return [row['tag'] for row in cursor.fetchall()]
-
-
-def search_tags(query: str, tag_type: Optional[str] = None, limit: int = 20) -> list[str]:
-    """Search tags by prefix."""
-    with get_cursor() as cursor:
-        if tag_type:
-            cursor.execute(
-                """SELECT DISTINCT tag FROM tags 
-                   WHERE tag LIKE ? AND tag_type = ? 
-                   ORDER BY tag LIMIT ?""",
-                (f"%{query}%", tag_type, limit)
-            )
-        else:
-            cursor.execute(
-                "SELECT DISTINCT tag FROM tags WHERE tag LIKE ? ORDER BY tag LIMIT ?",
-                (f"%{query}%", limit)
-            )
-        return [row['tag'] for row in cursor.fetchall()]
+        cursor.execute("SELECT tag, tag_type FROM tags ORDER BY tag")
+        return [(row['tag'], row['tag_type']) for row in cursor.fetchall()]
 
 
 # ============== Image operations ==============
 
-def get_or_create_image(path: str) -> int:
-    """Get or create an image record, return its ID."""
-    with get_cursor() as cursor:
-        cursor.execute("SELECT id FROM images WHERE path = ?", (path,))
-        row = cursor.fetchone()
-        if row:
-            return row['id']
-        
-        cursor.execute("INSERT INTO images (path) VALUES (?)", (path,))
-        return cursor.lastrowid
-
-
 def get_image_overlay_info(path: str, selected_fields: list[str] = None) -> dict:
     """Get overlay info for an image from tags, based on selected fields.
     
@@ -203,7 +241,7 @@ def get_image_overlay_info(path: str, selected_fields: list[str] = None) -> dict
     
     with get_cursor() as cursor:
         # Get image ID
-        cursor.execute("SELECT id FROM images WHERE path = ?", (path,))
+        cursor.execute(_SELECT_IMAGE_ID_SQL, (path,))
         row = cursor.fetchone()
         if not row:
             return result
@@ -254,7 +292,52 @@ def get_image_overlay_info(path: str, selected_fields: list[str] = None) -> dict
     return result
 
 
-def search_images(folder: str, search: str, tag_type: Optional[str], metadata_type: Optional[str], page: int, page_size: int) -> list[str]:
+_ASCII_LOWERCASE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _fold_ascii_case(text: str) -> str:
+    """Lowercase ASCII letters only, as SQLite's NOCASE collation does."""
+    return text.translate(_ASCII_LOWERCASE)
+
+
+@functools.lru_cache(maxsize=256)
+def _is_case_insensitive_folder(folder: str) -> bool:
+    """Check whether folder is on a case-insensitive volume (e.g. macOS's default)."""
+    swapped = folder.swapcase()
+    if swapped == folder:
+        # No letters, so no other casing to tell apart
+        return False
+    try:
+        return os.path.samefile(folder, swapped)
+    except OSError:
+        return False
+
+
+def _path_prefix_filter(folder: str, column: str = "path") -> tuple[str, tuple[str, str]]:
+    """Get a WHERE condition and its parameters for paths under folder.
+    
+    Unlike `path LIKE 'folder%'`, which treats % and _ in folder names as
+    wildcards, this is a range on column, so SQLite seeks an index instead of
+    scanning the table. On a case-insensitive volume the range is compared
+    with NOCASE - folding ASCII case like LIKE did - so a folder opened under
+    another casing still matches the paths indexed for it; elsewhere the
+    match is exact, keeping folders that differ only by case apart.
+    """
+    if not folder:
+        return f"{column} >= ? AND {column} < ?", ("", chr(0x10FFFF))
+    if not _is_case_insensitive_folder(folder):
+        return f"{column} >= ? AND {column} < ?", (folder, folder[:-1] + chr(ord(folder[-1]) + 1))
+    
+    lower = _fold_ascii_case(folder)
+    # NOCASE folds the bound too, and A-Z never occur once folded, so the
+    # character after '@' is '['
+    after_last = chr(ord(lower[-1]) + 1)
+    if after_last == "A":
+        after_last = "["
+    return f"{column} COLLATE NOCASE >= ? AND {column} COLLATE NOCASE < ?", (lower, lower[:-1] + after_last)
+
+
+def search_images(folder: str, search: str, tag_type: Optional[str], metadata_type: Optional[str], page: int, page_size: int) -> tuple[list[str], int]:
     """Search images by tag value. Supports multiple words - all words must match (in any tags).
     
     Args:
@@ -264,53 +347,33 @@ def search_images(folder: str, search: str, tag_type: Optional[str], metadata_ty
         metadata_type: 'iptc' or 'exif' to restrict search to that metadata category
         page: Page number (0-based)
         page_size: Results per page
+    
+    Returns:
+        The page of image paths, and the total number of matching images
     """
     offset = page * page_size
     
     # Split search into words
     words = search.split()
     if not words:
-        return []
+        return [], 0
     
-    # Determine which tag_types (fields) to search within
-    allowed_fields = _get_allowed_fields(tag_type, metadata_type)
+    where, params = _build_search_filter(folder, words, tag_type, metadata_type)
     
+    # The window count is taken over every match before LIMIT applies, so one
+    # evaluation of the filter yields both the page and the total
     with get_cursor() as cursor:
-        # Build query that requires ALL words to match (each word can be in different tags)
-        # For each word, we check if the image has at least one tag containing that word
-        base_query = """
-            SELECT DISTINCT i.path FROM images i
-            WHERE i.path LIKE ?
-        """
-        params = [f"{folder}%"]
-        
-        for word in words:
-            if allowed_fields is not None:
-                placeholders = ','.join('?' * len(allowed_fields))
-                base_query += f"""
-                    AND EXISTS (
-                        SELECT 1 FROM image_tags it
-                        JOIN tags t ON it.tag_id = t.id
-                        WHERE it.image_id = i.id AND t.tag LIKE ? AND t.tag_type IN ({placeholders})
-                    )
-                """
-                params.append(f"%{word}%")
-                params.extend(allowed_fields)
-            else:
-                base_query += """
-                    AND EXISTS (
-                        SELECT 1 FROM image_tags it
-                        JOIN tags t ON it.tag_id = t.id
-                        WHERE it.image_id = i.id AND t.tag LIKE ?
-                    )
-                """
-                params.append(f"%{word}%")
-        
-        base_query += " ORDER BY i.path LIMIT ? OFFSET ?"
-        params.extend([page_size, offset])
-        
-        cursor.execute(base_query, params)
-        return [row['path'] for row in cursor.fetchall()]
+        cursor.execute(
+            f"SELECT i.path, COUNT(*) OVER () AS total FROM images i WHERE {where} "
+            "ORDER BY i.path LIMIT ? OFFSET ?",
+            (*params, page_size, offset)
+        )
+        rows = cursor.fetchall()
+    
+    if rows:
+        return [row['path'] for row in rows], rows[0]['total']
+    # A page past the end has no rows to carry the total
+    return [], count_search_results(folder, search, tag_type, metadata_type) if offset else 0
 
 
 def count_search_results(folder: str, search: str, tag_type: Optional[str], metadata_type: Optional[str]) -> int:
@@ -320,42 +383,52 @@ def count_search_results(folder: str, search: str, tag_type: Optional[str], meta
     if not words:
         return 0
     
-    # Determine which tag_types (fields) to search within
-    allowed_fields = _get_allowed_fields(tag_type, metadata_type)
+    where, params = _build_search_filter(folder, words, tag_type, metadata_type)
     
     with get_cursor() as cursor:
-        base_query = """
-            SELECT COUNT(DISTINCT i.id) as cnt FROM images i
-            WHERE i.path LIKE ?
-        """
-        params = [f"{folder}%"]
-        
-        for word in words:
-            if allowed_fields is not None:
-                placeholders = ','.join('?' * len(allowed_fields))
-                base_query += f"""
-                    AND EXISTS (
-                        SELECT 1 FROM image_tags it
-                        JOIN tags t ON it.tag_id = t.id
-                        WHERE it.image_id = i.id AND t.tag LIKE ? AND t.tag_type IN ({placeholders})
-                    )
-                """
-                params.append(f"%{word}%")
-                params.extend(allowed_fields)
-            else:
-                base_query += """
-                    AND EXISTS (
-                        SELECT 1 FROM image_tags it
-                        JOIN tags t ON it.tag_id = t.id
-                        WHERE it.image_id = i.id AND t.tag LIKE ?
-                    )
-                """
-                params.append(f"%{word}%")
-        
-        cursor.execute(base_query, params)
+        cursor.execute(f"SELECT COUNT(*) as cnt FROM images i WHERE {where}", params)
         return cursor.fetchone()['cnt']
 
 
+def _build_search_filter(folder: str, words: list[str], tag_type: Optional[str], metadata_type: Optional[str]) -> tuple[str, list]:
+    """Build the WHERE clause (on images aliased i) shared by search and count.
+    
+    Each word selects the set of image ids having a matching tag once; the
+    sets are intersected, instead of running a correlated EXISTS per word
+    for every image in the folder.
+    """
+    # Determine which tag_types (fields) to search within
+    allowed_fields = _get_allowed_fields(tag_type, metadata_type)
+    
+    word_query = """
+        SELECT it.image_id FROM image_tags it
+        JOIN tags t ON it.tag_id = t.id
+        WHERE t.tag LIKE ?
+    """
+    if allowed_fields is not None:
+        placeholders = ','.join('?' * len(allowed_fields))
+        word_query += f" AND t.tag_type IN ({placeholders})"
+    
+    # A word contained in another word is implied by it (any tag matching
+    # "%cats%" also matches "%cat%"), so it would only add a redundant
+    # INTERSECT arm. Repeated words are dropped the same way.
+    words = [
+        word for i, word in enumerate(words)
+        if not any(word in other and (word != other or j < i)
+                   for j, other in enumerate(words) if j != i)
+    ]
+    
+    folder_condition, folder_params = _path_prefix_filter(folder, "i.path")
+    params = [*folder_params]
+    for word in words:
+        params.append(f"%{word}%")
+        if allowed_fields is not None:
+            params.extend(allowed_fields)
+    
+    where = f"{folder_condition} AND i.id IN ({' INTERSECT '.join([word_query] * len(words))})"
+    return where, params
+
+
 def _get_allowed_fields(tag_type: Optional[str], metadata_type: Optional[str]) -> Optional[list[str]]:
     """Get list of tag_type field names to search within.
     
@@ -378,61 +451,109 @@ def _get_allowed_fields(tag_type: Optional[str], metadata_type: Optional[str]) -
 
 def get_tagged_images(folder: str, tag_type: str) -> set[str]:
     """Get set of image paths that have tags of the specified type."""
+    # A semi-join: each image is tested for membership once, instead of
+    # joining every matching tag row and de-duplicating with DISTINCT
+    folder_condition, params = _path_prefix_filter(folder, "i.path")
     with get_cursor() as cursor:
-        cursor.execute("""
-            SELECT DISTINCT i.path FROM images i
-            JOIN image_tags it ON i.id = it.image_id
-            JOIN tags t ON it.tag_id = t.id
-            WHERE i.path LIKE ? AND t.tag_type = ?
-        """, (f"{folder}%", tag_type))
+        cursor.execute(f"""
+            SELECT i.path FROM images i
+            WHERE {folder_condition} AND i.id IN (
+                SELECT it.image_id FROM image_tags it
+                JOIN tags t ON it.tag_id = t.id
+                WHERE t.tag_type = ?
+            )
+        """, (*params, tag_type))
         return {row['path'] for row in cursor.fetchall()}
 
 
 # ============== Image-Tag associations ==============
 
-def clear_image_tags(image_id: int, tag_type: Optional[str] = None):
-    """Clear tag associations for an image."""
-    with get_cursor() as cursor:
-        if tag_type:
-            cursor.execute("""
-                DELETE FROM image_tags WHERE image_id = ? AND tag_id IN (
-                    SELECT id FROM tags WHERE tag_type = ?
-                )
-            """, (image_id, tag_type))
-        else:
-            cursor.execute("DELETE FROM image_tags WHERE image_id = ?", (image_id,))
+def _get_or_create_image_id(cursor: sqlite3.Cursor, path: str) -> int:
+    """Get or create an image record on an open cursor, return its ID."""
+    cursor.execute(_INSERT_IMAGE_SQL, (path,))
+    cursor.execute(_SELECT_IMAGE_ID_SQL, (path,))
+    return cursor.fetchone()['id']
 
 
-def add_image_tag(image_id: int, tag_id: int):
-    """Add a tag association to an image."""
+def replace_images_tags(images: list[tuple[str, float, dict[str, list[str]]]]):
+    """Replace every tag association of several images, e.g. when (re)indexing them.
+    
+    images is a list of (image_path, mtime, tags_by_type) tuples, where mtime
+    is the file's modification time when it was read and tags_by_type maps
+    tag types to their already-normalised values. The whole batch is written
+    in a single transaction with bulk statements, so a scan commits once per
+    batch rather than once per image.
+    """
+    # Images in a batch share most of their tags (keywords, camera, artist),
+    # so each distinct tag is inserted and looked up once per batch rather
+    # than once per image
+    unique_tags = list(dict.fromkeys(
+        (tag, tag_type)
+        for _, _, tags_by_type in images
+        for tag_type, tags in tags_by_type.items()
+        for tag in tags
+    ))
+    
     with get_cursor() as cursor:
-        cursor.execute(
-            "INSERT OR IGNORE INTO image_tags (image_id, tag_id) VALUES (?, ?)",
-            (image_id, tag_id)
-        )
+        cursor.executemany(_INSERT_TAG_SQL, unique_tags)
+        tag_ids = {key: cursor.execute(_SELECT_TAG_ID_SQL, key).fetchone()['id'] for key in unique_tags}
+        
+        links = []
+        for image_path, mtime, tags_by_type in images:
+            cursor.execute(_UPSERT_IMAGE_MTIME_SQL, (image_path, mtime))
+            image_id = cursor.execute(_SELECT_IMAGE_ID_SQL, (image_path,)).fetchone()['id']
+            cursor.execute("DELETE FROM image_tags WHERE image_id = ?", (image_id,))
+            links.extend(
+                (image_id, tag_ids[(tag, tag_type)])
+                for tag_type, tags in tags_by_type.items()
+                for tag in tags
+            )
+        
+        cursor.executemany(_INSERT_IMAGE_TAG_SQL, links)
 
 
 def update_image_tags(image_path: str, tag_type: str, values: list[str]):
-    """Update tags of a specific type for an image."""
-    image_id = get_or_create_image(image_path)
-    clear_image_tags(image_id, tag_type)
+    """Replace all tags of a type for an image.
+    
+    The image row, the cleared associations and the new tags are written in a
+    single transaction, so a save costs one commit rather than several.
+    """
+    tags = [value.strip() for value in values if value and value.strip()]
     
-    for value in values:
-        if value and value.strip():
-            tag_id = get_or_create_tag(value.strip(), tag_type)
-            add_image_tag(image_id, tag_id)
+    with get_cursor() as cursor:
+        image_id = _get_or_create_image_id(cursor, image_path)
+        
+        cursor.execute("""
+            DELETE FROM image_tags WHERE image_id = ? AND tag_id IN (
+                SELECT id FROM tags WHERE tag_type = ?
+            )
+        """, (image_id, tag_type))
+        
+        if tags:
+            tag_ids = _get_or_create_tag_ids(cursor, tags, tag_type)
+            cursor.executemany(_INSERT_IMAGE_TAG_SQL, [(image_id, tag_id) for tag_id in tag_ids])
 
 
 def get_indexed_images(folder: str) -> set[str]:
     """Get all image paths that are already indexed for a folder."""
+    folder_condition, params = _path_prefix_filter(folder)
     with get_cursor() as cursor:
-        cursor.execute(
-            "SELECT path FROM images WHERE path LIKE ?",
-            (f"{folder}%",)
-        )
+        cursor.execute(f"SELECT path FROM images WHERE {folder_condition}", params)
         return {row['path'] for row in cursor.fetchall()}
 
 
+def get_indexed_mtimes(folder: str) -> dict[str, Optional[float]]:
+    """Get the recorded modification time of every indexed image in a folder.
+    
+    The mtime is None for images indexed before modification times were
+    recorded.
+    """
+    folder_condition, params = _path_prefix_filter(folder)
+    with get_cursor() as cursor:
+        cursor.execute(f"SELECT path, mtime FROM images WHERE {folder_condition}", params)
+        return {row['path']: row['mtime'] for row in cursor.fetchall()}
+
+
 def purge_missing_images(folder: str, existing_files: set[str]) -> int:
     """Remove database records for images that no longer exist on disk.
     
@@ -449,17 +570,14 @@ def purge_missing_images(folder: str, existing_files: set[str]) -> int:
     if not missing:
         return 0
     
+    rows = [(path,) for path in missing]
     with get_cursor() as cursor:
-        for path in missing:
-            # Get image ID
-            cursor.execute("SELECT id FROM images WHERE path = ?", (path,))
-            row = cursor.fetchone()
-            if row:
-                image_id = row['id']
-                # Delete tag associations (cascades won't work without foreign_keys pragma)
-                cursor.execute("DELETE FROM image_tags WHERE image_id = ?", (image_id,))
-                # Delete image record
-                cursor.execute("DELETE FROM images WHERE id = ?", (image_id,))
+        # Delete tag associations (cascades won't work without foreign_keys pragma)
+        cursor.executemany(
+            "DELETE FROM image_tags WHERE image_id = (SELECT id FROM images WHERE path = ?)", rows
+        )
+        # Delete image records
+        cursor.executemany("DELETE FROM images WHERE path = ?", rows)
     
     return len(missing)
 
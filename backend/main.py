@@ -8,12 +8,13 @@ import os
 import sys
 import asyncio
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
 
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, Response
 from pydantic import BaseModel
 
 # Add backend to path
@@ -21,7 +22,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import config
 import database
-from services import image_service, metadata_service, scan_service, location_service
+from services import image_service, metadata_service, scan_service, location_service, tag_service
 
 
 # ============== Pydantic Models ==============
@@ -61,6 +62,15 @@ app = FastAPI(
 # Mount static files
 app.mount("/static", StaticFiles(directory=str(config.STATIC_DIR)), name="static")
 
+# Metadata writes go through a single worker: saves queue up and reach exiv2
+# one at a time, and never tie up the default pool that serves thumbnails
+_metadata_write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metadata-write")
+
+# Thumbnail and preview builds get a pool sized to the CPU count. Pillow
+# releases the GIL while decoding, resizing and encoding, so a page of
+# missing thumbnails is built in parallel across cores.
+_image_executor = ThreadPoolExecutor(max_workers=max(2, os.cpu_count() or 1), thread_name_prefix="image")
+
 
 @app.on_event("startup")
 async def startup():
@@ -68,6 +78,13 @@ async def startup():
     database.init_database()
 
 
+@app.on_event("shutdown")
+def shutdown():
+    """Drop queued image work, but let metadata writes finish before exit."""
+    _image_executor.shutdown(wait=False, cancel_futures=True)
+    _metadata_write_executor.shutdown(wait=True)
+
+
 # ============== HTML Template ==============
 
 @app.get("/", response_class=HTMLResponse)
@@ -147,8 +164,8 @@ async def open_directory(request: DirectoryRequest):
     if not os.path.isdir(folder_path):
         raise HTTPException(status_code=404, detail="Directory not found")
     
-    # Get images in folder
-    images = scan_service.get_images_in_folder(folder_path)
+    # Get images in folder - a recursive walk, so keep it off the event loop
+    images = await asyncio.to_thread(scan_service.get_images_in_folder, folder_path)
     
     return {
         "folder": folder_path,
@@ -201,15 +218,36 @@ async def list_images(
     metadata_type: str = ""
 ):
     """Get paginated list of images."""
-    search = search.strip()
-    tag_type = tag_type.strip()
-    metadata_type = metadata_type.strip()
+    # Listing walks the folder and queries SQLite, both blocking I/O - keep
+    # them off the event loop
+    images, total = await asyncio.to_thread(
+        _list_images_page,
+        folder,
+        page,
+        page_size,
+        search.strip(),
+        tag_type.strip(),
+        metadata_type.strip()
+    )
     
+    return {
+        "folder": folder,
+        "images": images,
+        "page": page,
+        "page_size": page_size,
+        "total_images": total,
+        "total_pages": (total + page_size - 1) // page_size if total > 0 else 1,
+    }
+
+
+def _list_images_page(
+    folder: str, page: int, page_size: int, search: str, tag_type: str, metadata_type: str
+) -> tuple[List[str], int]:
+    """Get one page of a folder's images and the total number of matches."""
     # Get images based on search mode
     if search:
         # Search terms provided - filter by those terms
-        images = database.search_images(folder, search, tag_type or None, metadata_type or None, page, page_size)
-        total = database.count_search_results(folder, search, tag_type or None, metadata_type or None)
+        images, total = database.search_images(folder, search, tag_type or None, metadata_type or None, page, page_size)
     elif tag_type:
         # No search terms but tag_type selected - show images WITHOUT any tags of this type
         all_images = set(scan_service.get_images_in_folder(folder))
@@ -225,14 +263,23 @@ async def list_images(
         start = page * page_size
         images = all_images[start:start + page_size]
     
-    return {
-        "folder": folder,
-        "images": images,
-        "page": page,
-        "page_size": page_size,
-        "total_images": total,
-        "total_pages": (total + page_size - 1) // page_size if total > 0 else 1,
-    }
+    return images, total
+
+
+def _cached_file_response(request: Request, path: str, media_type: str) -> Response:
+    """Serve a generated thumbnail or preview so the browser can reuse it.
+    
+    Sent with Cache-Control: no-cache - the browser keeps its copy but checks
+    it on each use. The ETag follows the file's mtime and size, so a rebuilt
+    file is fetched again at once, while an unchanged one is answered with a
+    bodiless 304.
+    """
+    stat_result = os.stat(path)
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    headers = {"Cache-Control": "no-cache", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
 
 
 @app.get("/api/images/thumbnail")
@@ -241,27 +288,33 @@ async def get_thumbnail(path: str, request: Request):
     if not os.path.isfile(path):
         raise HTTPException(status_code=404, detail="Image not found")
     
-    # Run thumbnail generation in a thread pool so it doesn't block the event loop
-    thumb_path = await asyncio.to_thread(image_service.ensure_thumbnail, path)
-    
-    # If the client disconnected while we were generating, don't bother responding
-    if await request.is_disconnected():
-        return
-    
-    if not thumb_path or not os.path.isfile(thumb_path):
-        raise HTTPException(status_code=500, detail="Thumbnail generation failed")
+    # Cache hits are served straight away, rather than queueing behind
+    # thumbnails still being generated in the image pool
+    thumb_path = image_service.get_cached_thumbnail(path)
+    if thumb_path is None:
+        # Run thumbnail generation in the image pool so it doesn't block the event loop
+        loop = asyncio.get_running_loop()
+        thumb_path = await loop.run_in_executor(_image_executor, image_service.ensure_thumbnail, path)
+        
+        # If the client disconnected while we were generating, don't bother responding
+        if await request.is_disconnected():
+            return
+        
+        if not thumb_path or not os.path.isfile(thumb_path):
+            raise HTTPException(status_code=500, detail="Thumbnail generation failed")
     
-    return FileResponse(thumb_path, media_type="image/jpeg")
+    return _cached_file_response(request, thumb_path, "image/jpeg")
 
 
 @app.get("/api/images/preview")
-async def get_preview(path: str, request: Request, edge: int = Query(default=2048)):
+async def get_preview(path: str, request: Request, edge: int = Query(default=2048, ge=1, le=16383)):
     """Get preview for an image."""
     if not os.path.isfile(path):
         raise HTTPException(status_code=404, detail="Image not found")
     
-    # Run preview generation in a thread pool so it doesn't block the event loop
-    preview_path = await asyncio.to_thread(image_service.ensure_preview, path, edge)
+    # Run preview generation in the image pool so it doesn't block the event loop
+    loop = asyncio.get_running_loop()
+    preview_path = await loop.run_in_executor(_image_executor, image_service.ensure_preview, path, edge)
     
     if await request.is_disconnected():
         return
@@ -269,7 +322,7 @@ async def get_preview(path: str, request: Request, edge: int = Query(default=204
     if not preview_path or not os.path.isfile(preview_path):
         raise HTTPException(status_code=500, detail="Preview generation failed")
     
-    return FileResponse(preview_path, media_type="image/jpeg")
+    return _cached_file_response(request, preview_path, "image/webp")
 
 
 @app.post("/api/images/open-in-viewer")
@@ -299,6 +352,12 @@ async def get_image_overlay_info(path: str):
     if not os.path.isfile(path):
         raise HTTPException(status_code=404, detail="Image not found")
     
+    # Database reads and place name lookups block - run them in a thread
+    return await asyncio.to_thread(_get_overlay_info, path)
+
+
+def _get_overlay_info(path: str) -> dict:
+    """Build the overlay info for an image from the index and preferences."""
     # Get user's selected overlay fields (stored as JSON)
     import json
     selected_fields_json = database.get_preference('overlay_fields')
@@ -343,8 +402,12 @@ async def get_metadata(
     if not os.path.isfile(path):
         raise HTTPException(status_code=404, detail="Image not found")
     
+    # exiv2 reads the file synchronously - keep it off the event loop so other
+    # requests (thumbnails, previews) are served while it runs
     if tag_type:
-        values = metadata_service.get_tag_values(path, tag_type, metadata_type)
+        values = await asyncio.to_thread(
+            metadata_service.get_tag_values, path, tag_type, metadata_type
+        )
         return {
             "path": path,
             "tag_type": tag_type,
@@ -352,7 +415,7 @@ async def get_metadata(
             "values": values,
         }
     else:
-        metadata = metadata_service.get_metadata(path)
+        metadata = await asyncio.to_thread(metadata_service.get_metadata, path)
         return {
             "path": path,
             "metadata": metadata,
@@ -365,7 +428,12 @@ async def update_metadata(request: MetadataUpdateRequest):
     if not os.path.isfile(request.path):
         raise HTTPException(status_code=404, detail="Image not found")
     
-    success = metadata_service.set_tag_values(
+    # Run the metadata write and index update on the write worker so a slow
+    # write (large files, network shares) doesn't block the event loop
+    loop = asyncio.get_running_loop()
+    success = await loop.run_in_executor(
+        _metadata_write_executor,
+        _save_tag_values,
         request.path,
         request.tag_type,
         request.values,
@@ -373,13 +441,25 @@ async def update_metadata(request: MetadataUpdateRequest):
     )
     
     if success:
-        # Update database index
-        database.update_image_tags(request.path, request.tag_type, request.values)
         return {"success": True}
     else:
         raise HTTPException(status_code=500, detail="Failed to write metadata")
 
 
+def _save_tag_values(path: str, tag_type: str, values: List[str], metadata_type: str) -> bool:
+    """Write tag values to the image file, then update the database index."""
+    # Canonicalise once, so the file, the index and the tag vocabulary all
+    # receive the same list
+    values = tag_service.normalize_values(values)
+    
+    if not metadata_service.set_tag_values(path, tag_type, values, metadata_type):
+        return False
+    
+    database.update_image_tags(path, tag_type, values)
+    tag_service.add_tags(tag_type, values)
+    return True
+
+
 @app.get("/api/metadata/definitions")
 async def get_metadata_definitions():
     """Get available metadata tag definitions."""
@@ -391,7 +471,7 @@ async def get_metadata_definitions():
 @app.get("/api/tags")
 async def list_tags(tag_type: Optional[str] = None):
     """List all tags."""
-    tags = database.get_tags_by_type(tag_type)
+    tags = await asyncio.to_thread(tag_service.get_tags, tag_type)
     return {"tags": tags}
 
 
@@ -402,7 +482,7 @@ async def search_tags(
     limit: int = 20
 ):
     """Search tags."""
-    tags = database.search_tags(q, tag_type, limit)
+    tags = await asyncio.to_thread(tag_service.search_tags, q, tag_type, limit)
     return {"tags": tags}
 
 
@@ -411,21 +491,21 @@ async def search_tags(
 @app.get("/api/preferences")
 async def get_preferences():
     """Get all preferences."""
-    prefs = database.get_all_preferences()
+    prefs = await asyncio.to_thread(database.get_all_preferences)
     return {"preferences": [{"key": k, "value": v} for k, v in prefs.items()]}
 
 
 @app.get("/api/preferences/{key}")
 async def get_preference(key: str):
     """Get a single preference."""
-    value = database.get_preference(key)
+    value = await asyncio.to_thread(database.get_preference, key)
     return {"key": key, "value": value}
 
 
 @app.put("/api/preferences/{key}")
 async def set_preference(key: str, request: PreferenceRequest):
     """Set a preference."""
-    database.set_preference(key, request.value)
+    await asyncio.to_thread(database.set_preference, key, request.value)
     return {"key": key, "value": request.value}
 
 
@@ -4,7 +4,12 @@ No Django dependencies.
 """
 
 import os
+import math
+import time
+import shutil
 import hashlib
+import functools
+import threading
 from PIL import Image, ImageOps
 
 from config import (
@@ -22,43 +27,146 @@ except ImportError:
     pass
 
 
+def _cache_file_hash(hash_input: str) -> str:
+    """Hash a cache key into a file name stem.
+    
+    Stays SHA-256 so caches written by earlier versions keep matching.
+    """
+    return hashlib.sha256(hash_input.encode()).hexdigest()
+
+
+# The cache path functions are memoised whole (abspath, hash and joins), since
+# the grid and viewer ask for the same images over and over. The server never
+# changes its working directory, so abspath results stay valid.
+@functools.lru_cache(maxsize=65536)
 def _preview_cache_path(image_path: str, edge_length: int) -> str:
     """Get the path for a cached preview image."""
     folder = os.path.dirname(image_path)
     cache_dir = os.path.join(folder, PREVIEW_CACHE_DIR_NAME)
-    os.makedirs(cache_dir, exist_ok=True)
     hash_input = f"{os.path.abspath(image_path)}::{edge_length}"
-    hash_str = hashlib.sha256(hash_input.encode()).hexdigest()
-    return os.path.join(cache_dir, f"{hash_str}.jpg")
+    hash_str = _cache_file_hash(hash_input)
+    return os.path.join(cache_dir, f"{hash_str}.webp")
 
 
 def _preview_is_current(image_path: str, preview_path: str) -> bool:
-    """Check if preview cache is up to date."""
+    """Check if preview cache exists and is up to date."""
     try:
         return os.path.getmtime(preview_path) >= os.path.getmtime(image_path)
     except OSError:
         return False
 
 
+@functools.lru_cache(maxsize=65536)
 def _thumbnail_cache_path(image_path: str) -> str:
     """Get the path for a cached thumbnail."""
     folder = os.path.dirname(image_path)
     thumb_dir = os.path.join(folder, THUMBNAIL_DIR_NAME)
-    os.makedirs(thumb_dir, exist_ok=True)
-    hash_str = hashlib.sha256(os.path.abspath(image_path).encode()).hexdigest()
+    hash_str = _cache_file_hash(os.path.abspath(image_path))
     return os.path.join(thumb_dir, f"{hash_str}.jpg")
 
 
-def _process_image(img: Image.Image) -> Image.Image:
-    """Process image for thumbnail/preview generation."""
+def get_cached_thumbnail(image_path: str) -> str | None:
+    """Get the path of an image's thumbnail if it is already cached, else None.
+    
+    A single stat, cheap enough to call from the event loop.
+    """
+    thumb_path = _thumbnail_cache_path(image_path)
+    return thumb_path if os.path.isfile(thumb_path) else None
+
+
+# Cache directories this process has swept for stale temporary files
+_swept_cache_dirs = set()
+
+# Temporary cache files older than this (seconds) were left by a build that
+# was killed part way - no single thumbnail or preview takes nearly as long
+_STALE_TMP_FILE_AGE = 600
+
+
+def _prepare_cache_dir(cache_dir: str) -> None:
+    """Create a cache directory, sweeping stale temporary files on first use.
+    
+    The directory is (re)created on every call, since the user may delete a
+    cache directory while the server runs. _write_atomically cleans up after
+    failed writes, but not after the process is killed mid-write, so each
+    directory is also swept once per process.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    if cache_dir in _swept_cache_dirs:
+        return
+    cutoff = time.time() - _STALE_TMP_FILE_AGE
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    _swept_cache_dirs.add(cache_dir)
+
+
+def _write_atomically(path: str, write) -> None:
+    """Create a cache file via a temporary sibling and os.replace.
+    
+    write(tmp_path) produces the file. Concurrent requests never see a
+    partly written file, and a failed or interrupted build leaves nothing at
+    path for a later cache-hit check to serve.
+    """
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _process_image(img: Image.Image, size: tuple) -> Image.Image:
+    """Orient and shrink an image to fit size, returning it in RGB."""
+    # Let the decoder produce a smaller image that still covers the result:
+    # JPEGs decode at a 1/2, 1/4 or 1/8 DCT scale. Must happen before the
+    # first pixel access (exif_transpose below); no-op for other formats,
+    # HEIF included, which are decoded in full and then resized.
+    img.draft("RGB", _fitted_size(img, size))
+    
     # Handle multi-frame images (like animated GIFs)
     if hasattr(img, "n_frames") and img.n_frames > 1:
         img.seek(0)
     
-    # Handle EXIF orientation
-    img = ImageOps.exif_transpose(img)
+    # Handle EXIF orientation. In place: otherwise an upright image (the
+    # common case) is returned as a full copy of the decoded pixels
+    ImageOps.exif_transpose(img, in_place=True)
+    
+    # Resize before converting, so the conversion only touches the small
+    # image. Modes that don't resample well (palette, 16/32-bit) are
+    # converted first.
+    if img.mode not in ("RGB", "RGBA", "L", "CMYK"):
+        img = _to_rgb(img)
+    img.thumbnail(size, Image.Resampling.LANCZOS)
+    
+    return _to_rgb(img)
+
+
+def _fitted_size(img: Image.Image, size: tuple) -> tuple:
+    """Get the image's dimensions once shrunk to fit size (never enlarged).
     
-    # Convert to RGB for compatibility with all modes
+    Fits within a square on the longest edge of size, so the result holds
+    whether or not EXIF orientation later swaps width and height.
+    """
+    edge = max(size)
+    scale = min(edge / img.width, edge / img.height, 1)
+    return (math.ceil(img.width * scale), math.ceil(img.height * scale))
+
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    """Convert an image to RGB, handling CMYK and high bit-depth modes."""
     if img.mode == "CMYK":
         from PIL import ImageChops
         img = ImageChops.invert(img)
@@ -68,12 +176,28 @@ def _process_image(img: Image.Image) -> Image.Image:
         img = img.point(lambda x: x / 256).convert("L")
         img = ImageOps.autocontrast(img)
         img = img.convert("RGB")
-    elif img.mode not in ("RGB", "RGBA", "L"):
+    elif img.mode != "RGB":
         img = img.convert("RGB")
     
     return img
 
 
+def _is_usable_as_is(img: Image.Image, max_size: tuple, image_format: str) -> bool:
+    """Check whether the source file can be cached unchanged.
+    
+    True for a file already in the cache's image_format that fits max_size,
+    is upright and is in a mode browsers display directly - re-encoding it
+    would only lose quality. Reads the header only, no pixels are decoded.
+    """
+    return (
+        img.format == image_format
+        and img.mode in ("RGB", "L")
+        and img.width <= max_size[0]
+        and img.height <= max_size[1]
+        and img.getexif().get(0x0112, 1) == 1  # Orientation: normal
+    )
+
+
 def ensure_thumbnail(image_path: str, size: tuple = None) -> str | None:
     """
     Ensure a thumbnail exists for the given image.
@@ -87,22 +211,25 @@ def ensure_thumbnail(image_path: str, size: tuple = None) -> str | None:
     if os.path.exists(thumb_path):
         return thumb_path
     
+    # Cache directories are only prepared on a miss, so cache hits cost a
+    # single stat
+    _prepare_cache_dir(os.path.dirname(thumb_path))
+    
     try:
         with Image.open(image_path) as img:
-            img = _process_image(img)
-            img.thumbnail(size, Image.LANCZOS)
-            
-            if img.mode != "RGB":
-                img = img.convert("RGB")
+            if _is_usable_as_is(img, size, "JPEG"):
+                _write_atomically(thumb_path, lambda tmp: shutil.copyfile(image_path, tmp))
+                return thumb_path
             
-            img.save(thumb_path, "JPEG", quality=85)
+            img = _process_image(img, size)
+            _write_atomically(thumb_path, lambda tmp: img.save(tmp, "JPEG", quality=85))
         return thumb_path
     except Exception as exc:
         print(f"Failed to create thumbnail for {image_path}: {exc}")
         # Write a placeholder so we don't retry
         try:
             placeholder = Image.new("RGB", size, (210, 210, 210))
-            placeholder.save(thumb_path, "JPEG", quality=60)
+            _write_atomically(thumb_path, lambda tmp: placeholder.save(tmp, "JPEG", quality=60))
             return thumb_path
         except Exception:
             return None
@@ -118,19 +245,25 @@ def ensure_preview(image_path: str, edge_length: int = None) -> str | None:
     
     preview_path = _preview_cache_path(image_path, edge_length)
     
-    if os.path.exists(preview_path) and _preview_is_current(image_path, preview_path):
+    if _preview_is_current(image_path, preview_path):
         return preview_path
     
+    _prepare_cache_dir(os.path.dirname(preview_path))
+    
     try:
         with Image.open(image_path) as img:
-            img = _process_image(img)
-            target_size = (edge_length, edge_length)
-            img.thumbnail(target_size, Image.LANCZOS)
-            
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-            
-            img.save(preview_path, "JPEG", quality=90)
+            # WebP rather than JPEG: markedly smaller files at the same
+            # visual quality, which every supported browser displays
+            img = _process_image(img, (edge_length, edge_length))
+            _write_atomically(
+                preview_path, lambda tmp: img.save(tmp, "WEBP", quality=85, method=4)
+            )
+        
+        # Drop the JPEG preview earlier versions cached under the same name
+        try:
+            os.remove(preview_path[:-len(".webp")] + ".jpg")
+        except OSError:
+            pass
         
         # Match timestamps
         try:
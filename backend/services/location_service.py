@@ -9,6 +9,9 @@ from typing import Optional, Tuple
 # Lazy-load reverse_geocoder to avoid startup delay
 _rg = None
 
+# Rational EXIF coordinate components, e.g. "2964/100"
+_RATIONAL_RE = re.compile(r'(\d+)/(\d+)')
+
 
 def _get_geocoder():
     """Lazy-load the reverse geocoder."""
@@ -75,7 +78,7 @@ def _parse_dms(value: str) -> Optional[float]:
     value = value.replace(',', ' ')
     
     # Try rational format: "37/1 46/1 2964/100"
-    rational_match = re.findall(r'(\d+)/(\d+)', value)
+    rational_match = _RATIONAL_RE.findall(value)
     if len(rational_match) >= 2:
         try:
             degrees = float(rational_match[0][0]) / float(rational_match[0][1])
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from simple_photo_meta.exiv2bind import Exiv2Bind
 from simple_photo_meta import iptc_tags, exif_tags
+from services import tag_service
 
 
 def get_metadata(image_path: str) -> dict:
@@ -40,13 +41,7 @@ def get_tag_values(image_path: str, tag_type: str, metadata_type: str = "iptc")
     """
     result = get_metadata(image_path)
     section = result.get(metadata_type, {})
-    value = section.get(tag_type)
-    
-    if isinstance(value, list):
-        return [v.strip() for v in value if v and v.strip()]
-    elif isinstance(value, str) and value.strip():
-        return [value.strip()]
-    return []
+    return tag_service.normalize_values(section.get(tag_type))
 
 
 def set_tag_values(image_path: str, tag_type: str, values: list, metadata_type: str = "iptc") -> bool:
@@ -74,14 +69,21 @@ def set_tag_values(image_path: str, tag_type: str, values: list, metadata_type:
         
         # Handle multi-valued vs single-valued tags
         if metadata_type == "iptc":
-            tag_def = next((t for t in iptc_tags.iptc_writable_tags if t["tag"] == tag_type), None)
+            tag_def = iptc_tags.iptc_writable_tags_by_tag.get(tag_type)
         else:
-            tag_def = next((t for t in exif_tags.exif_writable_tags if t["tag"] == tag_type), None)
+            tag_def = exif_tags.exif_writable_tags_by_tag.get(tag_type)
         
         if tag_def and tag_def.get("multi_valued", False):
-            current[metadata_type][tag_type] = values
+            new_value = values
         else:
-            current[metadata_type][tag_type] = values[0] if values else ""
+            new_value = values[0] if values else ""
+        
+        # The write rewrites the whole file - skip it if the field already
+        # holds exactly these values
+        if _same_value(current[metadata_type].get(tag_type), new_value):
+            return True
+        
+        current[metadata_type][tag_type] = new_value
         
         # Write back
         meta.from_dict(current)
@@ -91,6 +93,15 @@ def set_tag_values(image_path: str, tag_type: str, values: list, metadata_type:
         return False
 
 
+def _same_value(old, new) -> bool:
+    """Check whether a stored tag value already equals the value to write."""
+    if isinstance(new, list):
+        if isinstance(old, str):
+            old = [old] if old else []
+        return isinstance(old, list) and old == new
+    return (old or "") == new
+
+
 def get_tag_definitions() -> dict:
     """
     Get all available tag definitions.
@@ -6,8 +6,10 @@ No Django dependencies.
 import fnmatch
 import json
 import os
+import re
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 # Add parent to path for imports
@@ -15,6 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from config import SUPPORTED_EXTENSIONS, PREVIEW_CACHE_DIR_NAME, THUMBNAIL_DIR_NAME
 import database
+from services import tag_service
 from services.metadata_service import get_metadata
 from simple_photo_meta import iptc_tags, exif_tags
 
@@ -29,6 +32,20 @@ _scan_state = {
 }
 _scan_lock = threading.Lock()
 
+# Number of images whose tags are written to the database per transaction
+_SCAN_BATCH_SIZE = 200
+
+# Threads reading image metadata during a scan. One: exiv2 opens and parses
+# each file inside the binding, which isn't known to release the GIL or to be
+# safe to use from several threads at once, so reads stay serial. A single
+# reader still overlaps them with this module's SQLite writes, which run
+# without the GIL.
+_SCAN_READ_WORKERS = 1
+
+# Fields whose values are indexed, as sets for per-field membership tests
+_INDEXED_IPTC_FIELDS = frozenset(iptc_tags.iptc_writabable_fields_list)
+_INDEXED_EXIF_FIELDS = frozenset(exif_tags.exif_writable_fields_list)
+
 
 def _get_exclusion_patterns() -> list[str]:
     """Load exclusion patterns from preferences."""
@@ -42,38 +59,57 @@ def _get_exclusion_patterns() -> list[str]:
         return []
 
 
-def _is_excluded(dirname: str, patterns: list[str]) -> bool:
-    """Check if a directory name matches any exclusion pattern.
+def _compile_exclusion_patterns(patterns: list[str]) -> Optional[re.Pattern]:
+    """Combine exclusion patterns into a single regex (None if there are none).
     
     Supports shell-style wildcards via fnmatch:
       .*     — all dot-directories
       __*    — all dunder-directories
       backup — exact name match
     """
-    for pattern in patterns:
-        if fnmatch.fnmatch(dirname, pattern):
-            return True
-    return False
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+def _is_excluded(dirname: str, exclusion_re: re.Pattern) -> bool:
+    """Check if a directory name matches any exclusion pattern.
+    
+    One regex match per directory, instead of an fnmatch call (and its
+    pattern cache lookup) per pattern.
+    """
+    return exclusion_re.match(os.path.normcase(dirname)) is not None
 
 
 def get_images_in_folder(folder_path: str) -> list[str]:
     """Get list of all image files in folder (recursive)."""
-    exclusion_patterns = _get_exclusion_patterns()
+    exclusion_re = _compile_exclusion_patterns(_get_exclusion_patterns())
+    skipped_dirs = (THUMBNAIL_DIR_NAME, PREVIEW_CACHE_DIR_NAME)
     images = []
-    for root, dirs, files in os.walk(folder_path):
-        # Skip cache directories
-        if THUMBNAIL_DIR_NAME in dirs:
-            dirs.remove(THUMBNAIL_DIR_NAME)
-        if PREVIEW_CACHE_DIR_NAME in dirs:
-            dirs.remove(PREVIEW_CACHE_DIR_NAME)
-        
-        # Apply user-defined exclusion patterns (modify dirs in-place to skip subtrees)
-        if exclusion_patterns:
-            dirs[:] = [d for d in dirs if not _is_excluded(d, exclusion_patterns)]
-        
-        for fname in files:
-            if fname.lower().endswith(SUPPORTED_EXTENSIONS):
-                images.append(os.path.join(root, fname))
+    # Walk with scandir directly: each entry's type comes from the directory
+    # listing itself, and its path is already joined. Like os.walk, symlinked
+    # directories are not followed and unreadable directories are skipped.
+    pending_dirs = [folder_path]
+    while pending_dirs:
+        try:
+            with os.scandir(pending_dirs.pop()) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if is_dir:
+                        # Skip cache directories, then apply user-defined exclusion patterns
+                        if entry.name in skipped_dirs or entry.is_symlink():
+                            continue
+                        if exclusion_re and _is_excluded(entry.name, exclusion_re):
+                            continue
+                        pending_dirs.append(entry.path)
+                    elif entry.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        images.append(entry.path)
+        except OSError:
+            continue
     
     return sorted(images)
 
@@ -118,20 +154,28 @@ def start_scan(folder_path: str, force: bool = False) -> bool:
     # Start background thread
     thread = threading.Thread(target=_run_scan, args=(folder_path, force))
     thread.daemon = True
-    thread.start()
+    try:
+        thread.start()
+    except Exception:
+        # Don't leave the scan flagged as running if the worker never started
+        with _scan_lock:
+            _scan_state["running"] = False
+            _scan_state["folder"] = None
+        raise
     
     return True
 
 
 def _run_scan(folder_path: str, force: bool = False):
     """Background scan worker."""
+    abs_folder_path = os.path.abspath(folder_path)
     try:
         # Get list of all images in folder
         all_images = get_images_in_folder(folder_path)
         all_images_set = set(all_images)
         
         # Purge database records for files that no longer exist
-        purged = database.purge_missing_images(os.path.abspath(folder_path), all_images_set)
+        purged = database.purge_missing_images(abs_folder_path, all_images_set)
         if purged > 0:
             print(f"Purged {purged} missing image(s) from database")
         
@@ -139,75 +183,140 @@ def _run_scan(folder_path: str, force: bool = False):
             # Full rescan - process all images
             images_to_scan = all_images
         else:
-            # Incremental scan - only process new images
-            indexed_images = database.get_indexed_images(os.path.abspath(folder_path))
-            images_to_scan = [img for img in all_images if img not in indexed_images]
+            # Incremental scan - only process new images, and indexed ones
+            # modified since they were last read
+            indexed_mtimes = database.get_indexed_mtimes(abs_folder_path)
+            images_to_scan = [img for img in all_images if _needs_indexing(img, indexed_mtimes)]
         
         with _scan_lock:
             _scan_state["total"] = len(images_to_scan)
         
         if len(images_to_scan) == 0:
-            # Nothing to scan
-            with _scan_lock:
-                _scan_state["running"] = False
-                _scan_state["folder"] = None
+            # Nothing to scan (scan state is reset in the finally block)
             return
         
-        for image_path in images_to_scan:
-            with _scan_lock:
-                if _scan_state["cancelled"]:
-                    break
+        # Collect indexing errors and report them in one write at the end,
+        # rather than printing to the console from inside the scan loop
+        errors = []
+        cancelled = False
+        # Metadata is read on a reader thread, while this thread stays the
+        # only one writing to the database. Reads are submitted a batch at a
+        # time and each batch is written in one transaction. The next batch
+        # is queued before the current one is consumed, so the reader keeps
+        # going while this thread writes, and a cancel leaves at most two
+        # batches of reads queued.
+        batches = [
+            images_to_scan[start:start + _SCAN_BATCH_SIZE]
+            for start in range(0, len(images_to_scan), _SCAN_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=_SCAN_READ_WORKERS, thread_name_prefix="scan") as pool:
+            def submit_reads(batch):
+                return [pool.submit(_read_image_tags, image_path) for image_path in batch]
             
-            try:
-                _index_image(image_path)
-            except Exception as e:
-                print(f"Error indexing {image_path}: {e}")
-            
-            with _scan_lock:
-                _scan_state["processed"] += 1
+            next_futures = submit_reads(batches[0])
+            for index, batch in enumerate(batches):
+                futures = next_futures
+                next_futures = submit_reads(batches[index + 1]) if index + 1 < len(batches) else []
+                
+                pending = []
+                for image_path, future in zip(batch, futures):
+                    try:
+                        pending.append((image_path, *future.result()))
+                    except Exception as e:
+                        errors.append(f"  {image_path}: {e}")
+                    
+                    # Publish progress and check for cancellation under a
+                    # single lock acquisition per image
+                    with _scan_lock:
+                        _scan_state["processed"] += 1
+                        cancelled = _scan_state["cancelled"]
+                    if cancelled:
+                        for queued in futures + next_futures:
+                            queued.cancel()
+                        break
+                
+                # Images read before a cancel are still written
+                if pending:
+                    _write_image_tags(pending, errors)
+                if cancelled:
+                    break
+        
+        if errors:
+            print(f"Error indexing {len(errors)} image(s):\n" + "\n".join(errors))
         
         # Mark directory as scanned
-        database.mark_directory_scanned(os.path.abspath(folder_path))
+        database.mark_directory_scanned(abs_folder_path)
+        database.optimize()
+        database.checkpoint()
     
     finally:
+        database.close_connection()
         with _scan_lock:
             _scan_state["running"] = False
             _scan_state["folder"] = None
 
 
-def _index_image(image_path: str):
-    """Index a single image's metadata."""
-    # Get or create image record
-    image_id = database.get_or_create_image(image_path)
+def _needs_indexing(image_path: str, indexed_mtimes: dict) -> bool:
+    """Check whether an incremental scan should (re)read an image.
     
-    # Clear existing tag associations
-    database.clear_image_tags(image_id)
+    True for images not indexed yet, or whose file has changed since it was
+    read. Images indexed before modification times were recorded are left to
+    a forced rescan, so upgrading doesn't turn the next scan into a full one.
+    """
+    if image_path not in indexed_mtimes:
+        return True
+    indexed_mtime = indexed_mtimes[image_path]
+    if indexed_mtime is None:
+        return False
+    try:
+        return os.path.getmtime(image_path) != indexed_mtime
+    except OSError:
+        return False
+
+
+def _read_image_tags(image_path: str) -> tuple[float, dict[str, list[str]]]:
+    """Read a single image's metadata into its tag values by type.
+    
+    Returns the file's modification time along with the tags. It is taken
+    before the metadata is read, so a change made mid-read is picked up by
+    the next scan.
+    """
+    mtime = os.path.getmtime(image_path)
     
     # Read metadata
     metadata = get_metadata(image_path)
     
-    # Index IPTC fields
-    iptc_data = metadata.get("iptc", {})
-    for field in iptc_tags.iptc_writabable_fields_list:
-        value = iptc_data.get(field)
-        _index_tag_values(image_id, field, value)
+    # Collect the values of every indexed IPTC and EXIF field. Only the
+    # fields the image actually has are visited - usually a handful, rather
+    # than the full list of writable fields.
+    tags_by_type = {}
+    for field, value in metadata.get("iptc", {}).items():
+        if field in _INDEXED_IPTC_FIELDS:
+            _collect_tag_values(tags_by_type, field, value)
+    
+    for field, value in metadata.get("exif", {}).items():
+        if field in _INDEXED_EXIF_FIELDS:
+            _collect_tag_values(tags_by_type, field, value)
     
-    # Index EXIF fields
-    exif_data = metadata.get("exif", {})
-    for field in exif_tags.exif_writable_fields_list:
-        value = exif_data.get(field)
-        _index_tag_values(image_id, field, value)
-
-
-def _index_tag_values(image_id: int, tag_type: str, value):
-    """Index tag values for an image."""
-    if isinstance(value, list):
-        tags = [t for t in value if t and str(t).strip()]
-    elif isinstance(value, str) and value.strip():
-        tags = [value.strip()]
-    else:
+    return mtime, tags_by_type
+
+
+def _write_image_tags(images: list[tuple[str, float, dict]], errors: list[str]):
+    """Write a batch of read images to the database and the tag vocabulary."""
+    try:
+        # Replace the images' existing associations in one transaction
+        database.replace_images_tags(images)
+    except Exception as e:
+        errors.extend(f"  {image_path}: {e}" for image_path, _, _ in images)
         return
     
-    for tag_text in tags:
-        tag_id = database.get_or_create_tag(str(tag_text).strip(), tag_type)
-        database.add_image_tag(image_id, tag_id)
+    for _, _, tags_by_type in images:
+        for tag_type, tags in tags_by_type.items():
+            tag_service.add_tags(tag_type, tags)
+
+
+def _collect_tag_values(tags_by_type: dict, tag_type: str, value):
+    """Add a field's normalised tag values to tags_by_type."""
+    tags = tag_service.normalize_values(value)
+    if tags:
+        tags_by_type.setdefault(tag_type, []).extend(tags)
@@ -0,0 +1,143 @@
+"""
+Tag vocabulary service - in-memory index of all known tag values.
+Loaded once from the database, then kept current as tags are written.
+"""
+
+import bisect
+import threading
+from typing import Optional
+
+import database
+
+
+# tag_type -> sorted list of tag values. The None key holds the distinct
+# values across all tag types. None until first use.
+_tags_by_type: Optional[dict] = None
+
+# tag_type -> set of the same tag values, for constant-time "already known"
+# checks before touching the sorted lists
+_tag_sets: dict = {}
+
+# tag_type -> {bigram: set of tags whose lowercased form contains it}.
+# Built lazily per tag type for substring search, then kept current as tags
+# are added.
+_bigram_indexes: dict = {}
+
+_tags_lock = threading.Lock()
+
+
+def _ensure_loaded() -> dict:
+    """Load the vocabulary from the database on first use (caller holds the lock)."""
+    global _tags_by_type
+    if _tags_by_type is None:
+        tags_by_type = {None: []}
+        for tag, tag_type in database.get_all_tags():
+            # Rows arrive ordered by tag, so plain appends keep each list sorted
+            tags_by_type.setdefault(tag_type, []).append(tag)
+            all_tags = tags_by_type[None]
+            if not all_tags or all_tags[-1] != tag:
+                all_tags.append(tag)
+        _tags_by_type = tags_by_type
+        _tag_sets.clear()
+        for tag_type, tags in tags_by_type.items():
+            _tag_sets[tag_type] = set(tags)
+    return _tags_by_type
+
+
+def _insert_tag(tag_type: Optional[str], tag: str) -> bool:
+    """Insert tag into a type's sorted list unless it is already known.
+    
+    Returns True if the tag was inserted.
+    """
+    known = _tag_sets.setdefault(tag_type, set())
+    if tag in known:
+        return False
+    known.add(tag)
+    bisect.insort(_tags_by_type.setdefault(tag_type, []), tag)
+    return True
+
+
+def _bigrams(text: str) -> set[str]:
+    """Get the set of two-character substrings of text."""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _index_bigrams(index: dict, tag: str):
+    """Add a tag to the posting sets of a bigram index."""
+    for bigram in _bigrams(tag.lower()):
+        index.setdefault(bigram, set()).add(tag)
+
+
+def _ensure_bigram_index(tag_type: Optional[str]) -> dict:
+    """Build the bigram index for a tag type on first use (caller holds the lock)."""
+    index = _bigram_indexes.get(tag_type)
+    if index is None:
+        index = {}
+        for tag in _ensure_loaded().get(tag_type, []):
+            _index_bigrams(index, tag)
+        _bigram_indexes[tag_type] = index
+    return index
+
+
+def normalize_values(value) -> list[str]:
+    """Turn a field value (a string or list of strings) into its tag values.
+    
+    Values are stripped, and empty or repeated ones dropped, keeping the
+    original order. Used wherever values are written, indexed or read, so all
+    of them agree on the same canonical list.
+    """
+    if isinstance(value, str):
+        value = [value]
+    elif not isinstance(value, list):
+        return []
+    stripped = (str(v).strip() for v in value if v)
+    return list(dict.fromkeys(v for v in stripped if v))
+
+
+def get_tags(tag_type: Optional[str] = None) -> list[str]:
+    """Get all unique tags in sorted order, optionally filtered by type."""
+    with _tags_lock:
+        tags_by_type = _ensure_loaded()
+        return list(tags_by_type.get(tag_type or None, []))
+
+
+def search_tags(query: str, tag_type: Optional[str] = None, limit: int = 20) -> list[str]:
+    """Search tags by case-insensitive substring, returning at most limit in sorted order."""
+    needle = query.lower()
+    tag_type = tag_type or None
+    with _tags_lock:
+        if len(needle) < 2:
+            # Too short for the bigram index - scan the (already sorted) list
+            matches = []
+            for tag in _ensure_loaded().get(tag_type, []):
+                if needle in tag.lower():
+                    matches.append(tag)
+                    if len(matches) >= limit:
+                        break
+            return matches
+        
+        # Intersect the posting sets of every bigram in the query (smallest
+        # first), then confirm the full substring on that shortlist only
+        index = _ensure_bigram_index(tag_type)
+        postings = sorted((index.get(bigram, set()) for bigram in _bigrams(needle)), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        matches = sorted(tag for tag in candidates if needle in tag.lower())
+        return matches[:limit]
+
+
+def add_tags(tag_type: str, tags: list[str]):
+    """Record tag values that have just been written to the database."""
+    with _tags_lock:
+        if _tags_by_type is None:
+            # Not loaded yet - the first load will read them from the database
+            return
+        
+        # Update only the indexes that have been built, and only with tags
+        # that are actually new, rather than rebuilding them on next search
+        type_index = _bigram_indexes.get(tag_type)
+        all_index = _bigram_indexes.get(None)
+        for tag in tags:
+            if _insert_tag(tag_type, tag) and type_index is not None:
+                _index_bigrams(type_index, tag)
+            if _insert_tag(None, tag) and all_index is not None:
+                _index_bigrams(all_index, tag)
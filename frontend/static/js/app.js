@@ -30,13 +30,21 @@ const state = {
     tagType: '',
     currentTags: [],
     originalTags: [],
-    hasUnsavedChanges: false,
+    hasUnsavedChanges: false,     // True when the last auto-save of the shown tags failed; cleared on load/save
     tagDefinitions: null,
-    scanPollingInterval: null,
+    scanPollTimer: null,          // Timer ID for the next scan status poll
+    scanPollGeneration: 0,        // Bumped on each pollScanStatus() to retire older poll chains
     previewRotation: 0,  // Current rotation angle (0, 90, 180, 270)
     thumbnailLoadAbort: null,   // AbortController for the current in-flight thumbnail fetch
     thumbnailDebounceTimer: null, // Timer ID for the 1-second page-settle debounce
-    thumbnailCache: new Map(),    // imagePath → blob URL for already-fetched thumbnails
+    thumbnailCache: new Map(),    // imagePath → blob URL for already-fetched thumbnails, least recently used first
+    pageRefreshPending: false,    // True while a coalesced loadCurrentPage() is queued
+    saveStatusTimer: null,        // Timer ID that clears the save status message
+    saveInFlight: null,           // Promise for the running auto-save, if any
+    queuedSaves: new Map(),       // image/field key → snapshot of tags waiting to be written
+    previewPrefetches: [],        // Image objects warming the previews of the selected image's neighbours
+    pageLoadGeneration: 0,        // Bumped on each loadCurrentPage() so only the latest response is applied
+    thumbnailSrcQueue: [],        // [img, blobUrl] pairs waiting for the next animation frame
 };
 
 // DOM Elements cache
@@ -133,8 +141,14 @@ function setupEventListeners() {
     elements.btnPreferences.addEventListener('click', () => elements.preferencesDialog.showModal());
     elements.btnAbout.addEventListener('click', () => elements.aboutDialog.showModal());
     
-    // Search - real-time with debounce (300ms delay)
-    const debouncedSearch = debounce(handleSearch, 300);
+    // Search - real-time with debounce (300ms delay). Edits that leave the
+    // query unchanged (e.g. trailing spaces) don't reload the page.
+    const debouncedSearch = debounce(() => {
+        const query = elements.searchInput.value.trim();
+        if (query !== state.searchQuery) {
+            runSearch(query);
+        }
+    }, 300);
     elements.searchInput.addEventListener('input', debouncedSearch);
     elements.btnSearch.addEventListener('click', handleSearch);
     elements.btnClearSearch.addEventListener('click', handleClearSearch);
@@ -161,6 +175,14 @@ function setupEventListeners() {
     });
     elements.btnAddTag.addEventListener('click', handleAddTag);
     
+    // Tag list - one delegated listener serves every row's delete button
+    elements.tagList.addEventListener('click', (e) => {
+        const deleteBtn = e.target.closest('.tag-delete');
+        if (deleteBtn) {
+            removeTag(deleteBtn.closest('.tag-item'));
+        }
+    });
+    
     // Dialog buttons
     elements.btnSavePrefs.addEventListener('click', handleSavePreferences);
     elements.btnClosePrefs.addEventListener('click', () => elements.preferencesDialog.close());
@@ -296,22 +318,35 @@ async function populateOverlayFieldCheckboxes() {
     container.innerHTML = html;
 }
 
+// Field selector <option> elements, built once per metadata type
+const tagTypeOptionsCache = new Map();
+
 function updateTagTypeSelector() {
     if (!state.tagDefinitions) return;
     
-    const definitions = state.metadataType === 'iptc' 
-        ? state.tagDefinitions.iptc 
-        : state.tagDefinitions.exif;
-    
-    elements.tagType.innerHTML = '<option value="">Select a field...</option>';
-    
-    for (const def of definitions) {
-        const option = document.createElement('option');
-        option.value = def.tag;
-        option.textContent = def.name;
-        option.title = def.description;
-        elements.tagType.appendChild(option);
+    let options = tagTypeOptionsCache.get(state.metadataType);
+    if (!options) {
+        const definitions = state.metadataType === 'iptc' 
+            ? state.tagDefinitions.iptc 
+            : state.tagDefinitions.exif;
+        
+        const placeholder = document.createElement('option');
+        placeholder.value = '';
+        placeholder.textContent = 'Select a field...';
+        options = [placeholder];
+        
+        for (const def of definitions) {
+            const option = document.createElement('option');
+            option.value = def.tag;
+            option.textContent = def.name;
+            option.title = def.description;
+            options.push(option);
+        }
+        tagTypeOptionsCache.set(state.metadataType, options);
     }
+    
+    // Swap the whole list in with one DOM operation
+    elements.tagType.replaceChildren(...options);
 }
 
 // Folder operations
@@ -464,12 +499,13 @@ async function changePage(delta) {
 async function loadCurrentPage() {
     if (!state.currentFolder) return;
     
-    // Always read the current field dropdown value for filtering
-    // When tag_type is selected:
+    // Filter by the selected field, which the field dropdown's change
+    // handlers keep in state.tagType. When tag_type is selected:
     // - With search: filter by search term AND tag_type
     // - Without search: show images WITHOUT any tags of this type (untagged)
-    const currentTagType = elements.tagType ? elements.tagType.value : '';
+    const currentTagType = state.tagType;
     
+    const generation = ++state.pageLoadGeneration;
     const result = await getImages(
         state.currentFolder,
         state.page,
@@ -479,15 +515,35 @@ async function loadCurrentPage() {
         state.metadataType || ''
     );
     
+    // A newer load was started while this one was in flight (e.g. more
+    // typing in the search box) - its response supersedes this one
+    if (generation !== state.pageLoadGeneration) return;
+    
     if (result.data) {
-        state.images = result.data.images;
+        const newImages = result.data.images;
+        // Only re-render thumbnails if the image list actually changed
+        const imagesChanged = JSON.stringify(state.images) !== JSON.stringify(newImages);
+        state.images = newImages;
         state.totalImages = result.data.total_images;
         state.totalPages = result.data.total_pages;
         updatePaginationControls();
-        renderThumbnails();
+        if (imagesChanged) {
+            renderThumbnails();
+        }
     }
 }
 
+// Queue a thumbnail grid refresh. Requests made in the same turn of the
+// event loop (e.g. a field change followed by a save) share one reload.
+function requestPageRefresh() {
+    if (state.pageRefreshPending) return;
+    state.pageRefreshPending = true;
+    setTimeout(() => {
+        state.pageRefreshPending = false;
+        loadCurrentPage();
+    }, 0);
+}
+
 // Scanning
 async function startScanProcess(folder, force = false) {
     const result = await startScan(folder, force);
@@ -508,33 +564,45 @@ async function handleRescan() {
 }
 
 function pollScanStatus() {
-    if (state.scanPollingInterval) {
-        clearInterval(state.scanPollingInterval);
+    if (state.scanPollTimer) {
+        clearTimeout(state.scanPollTimer);
     }
     
-    state.scanPollingInterval = setInterval(async () => {
+    // Chain timeouts instead of using setInterval, so a slow status request
+    // never overlaps the next poll and responses can't pile up
+    const generation = ++state.scanPollGeneration;
+    let shownProcessed = -1;
+    
+    const poll = async () => {
         const result = await getScanStatus();
+        if (generation !== state.scanPollGeneration) return;  // Superseded by a newer poll
         
         if (result.data) {
             const { running, processed, total } = result.data;
             
-            if (total > 0) {
+            // Only touch the progress bar when the count has moved
+            if (total > 0 && processed !== shownProcessed) {
+                shownProcessed = processed;
                 const percent = (processed / total) * 100;
                 elements.progressFill.style.width = `${percent}%`;
                 elements.scanStatus.textContent = `Scanning: ${processed} of ${total} images`;
             }
             
             if (!running) {
-                clearInterval(state.scanPollingInterval);
-                state.scanPollingInterval = null;
+                state.scanPollTimer = null;
                 elements.scanProgress.classList.add('hidden');
                 elements.rescanContainer.classList.remove('hidden');
                 
                 // Refresh the current page
                 await loadCurrentPage();
+                return;
             }
         }
-    }, 500);
+        
+        state.scanPollTimer = setTimeout(poll, 500);
+    };
+    
+    state.scanPollTimer = setTimeout(poll, 500);
 }
 
 // Thumbnails
@@ -557,30 +625,49 @@ function renderThumbnails() {
         return;
     }
     
+    // Items for images still on the page (e.g. when a save drops one image
+    // from a filtered page and the rest shift up) are kept as they are, with
+    // their loaded thumbnails, rather than rebuilt
+    const existingItems = new Map();
+    for (const item of elements.thumbnailGrid.querySelectorAll('.thumbnail-item')) {
+        existingItems.set(item.dataset.path, item);
+    }
+    
     // Render all items immediately; use cached blob URL if available
-    elements.thumbnailGrid.innerHTML = '';
+    const items = [];
     const uncachedImages = [];
+    const imgByPath = new Map();  // imagePath → its <img>, for the loader below
     
     for (const imagePath of state.images) {
-        const item = createThumbnailElement(imagePath);
-        elements.thumbnailGrid.appendChild(item);
+        let item = existingItems.get(imagePath);
+        if (item) {
+            item.classList.toggle('selected', imagePath === state.selectedImage);
+            getCachedThumbnail(imagePath);  // Still in view - mark as recently used
+        } else {
+            item = createThumbnailElement(imagePath);
+        }
+        items.push(item);
 
         if (!state.thumbnailCache.has(imagePath)) {
             uncachedImages.push(imagePath);
+            imgByPath.set(imagePath, item.querySelector('img'));
         }
     }
+    
+    // Swap the grid's contents in a single DOM operation
+    elements.thumbnailGrid.replaceChildren(...items);
 
     // Fetch uncached thumbnails after a short debounce to let rapid
     // page clicks settle (avoids queuing work for pages the user skips through)
     if (uncachedImages.length > 0) {
         state.thumbnailDebounceTimer = setTimeout(() => {
             state.thumbnailDebounceTimer = null;
-            loadThumbnailsBatched(uncachedImages);
+            loadThumbnailsBatched(uncachedImages, imgByPath);
         }, 150);
     }
 }
 
-async function loadThumbnailsBatched(imagePaths) {
+async function loadThumbnailsBatched(imagePaths, imgByPath) {
     const BATCH_SIZE = 6; // parallel requests per batch
     const controller = new AbortController();
     state.thumbnailLoadAbort = controller;
@@ -595,14 +682,12 @@ async function loadThumbnailsBatched(imagePaths) {
                 const response = await fetch(getThumbnailUrl(imagePath), { signal: controller.signal });
                 const blob = await response.blob();
                 const blobUrl = URL.createObjectURL(blob);
-                state.thumbnailCache.set(imagePath, blobUrl);
+                cacheThumbnail(imagePath, blobUrl);
 
-                // Find the matching <img> in the grid and set its src
-                const item = elements.thumbnailGrid.querySelector(`.thumbnail-item[data-path="${CSS.escape(imagePath)}"]`);
-                if (item) {
-                    const img = item.querySelector('img');
-                    if (img) img.src = blobUrl;
-                }
+                // Set the src of the matching <img>, looked up when the grid
+                // was rendered rather than by a selector query per thumbnail
+                const img = imgByPath.get(imagePath);
+                if (img) queueThumbnailSrc(img, blobUrl);
             } catch {
                 // Aborted or network error — ignore individual failures
             }
@@ -615,6 +700,45 @@ async function loadThumbnailsBatched(imagePaths) {
     }
 }
 
+// Thumbnails that arrive close together are applied to the grid in one
+// animation frame, rather than each touching the DOM as its fetch resolves
+function queueThumbnailSrc(img, blobUrl) {
+    if (state.thumbnailSrcQueue.length === 0) {
+        requestAnimationFrame(() => {
+            const queued = state.thumbnailSrcQueue;
+            state.thumbnailSrcQueue = [];
+            for (const [queuedImg, queuedUrl] of queued) {
+                queuedImg.src = queuedUrl;
+            }
+        });
+    }
+    state.thumbnailSrcQueue.push([img, blobUrl]);
+}
+
+// Blob URLs kept for thumbnails - enough for many pages of browsing while
+// bounding the decoded-image memory held by a long session
+const THUMBNAIL_CACHE_LIMIT = 500;
+
+function cacheThumbnail(imagePath, blobUrl) {
+    state.thumbnailCache.set(imagePath, blobUrl);
+    // Maps iterate in insertion order, so the first key is the least recently used
+    while (state.thumbnailCache.size > THUMBNAIL_CACHE_LIMIT) {
+        const [oldestPath, oldestUrl] = state.thumbnailCache.entries().next().value;
+        state.thumbnailCache.delete(oldestPath);
+        URL.revokeObjectURL(oldestUrl);
+    }
+}
+
+function getCachedThumbnail(imagePath) {
+    const blobUrl = state.thumbnailCache.get(imagePath);
+    if (blobUrl) {
+        // Re-insert to mark as most recently used
+        state.thumbnailCache.delete(imagePath);
+        state.thumbnailCache.set(imagePath, blobUrl);
+    }
+    return blobUrl;
+}
+
 function createThumbnailElement(imagePath) {
     const item = document.createElement('div');
     item.className = 'thumbnail-item';
@@ -625,11 +749,14 @@ function createThumbnailElement(imagePath) {
     
     const img = document.createElement('img');
     img.alt = getFilename(imagePath);
+    // Decode (and scale for the display's pixel ratio) off the main thread,
+    // so a page of thumbnails arriving at once doesn't stall repaints
+    img.decoding = 'async';
     // Hidden via CSS (opacity 0) until loaded to avoid broken-image borders
     img.addEventListener('load', () => img.classList.add('loaded'));
     
     // If already cached, set src immediately
-    const cachedUrl = state.thumbnailCache.get(imagePath);
+    const cachedUrl = getCachedThumbnail(imagePath);
     if (cachedUrl) {
         img.src = cachedUrl;
     }
@@ -652,26 +779,29 @@ function getFilename(path) {
 
 // Image selection
 async function selectImage(imagePath) {
-    // Check for unsaved changes
+    // Let a pending auto-save finish first. Edits are saved as they are made,
+    // so only a failed save leaves changes to ask about.
+    if (state.saveInFlight) {
+        await state.saveInFlight;
+    }
     if (state.hasUnsavedChanges) {
         const save = confirm('You have unsaved changes. Do you want to save them?');
         if (save) {
-            await handleSave();
+            await saveTagsImmediately();
         }
     }
     
     state.selectedImage = imagePath;
     state.hasUnsavedChanges = false;
     
-    // Update thumbnail selection
-    document.querySelectorAll('.thumbnail-item').forEach(el => el.classList.remove('selected'));
-    const items = document.querySelectorAll('.thumbnail-item');
-    for (const item of items) {
-        const img = item.querySelector('img');
-        if (img && img.src === getThumbnailUrl(imagePath)) {
-            item.classList.add('selected');
-            break;
-        }
+    // Update thumbnail selection - only the old and new items change state
+    const previousItem = elements.thumbnailGrid.querySelector('.thumbnail-item.selected');
+    if (previousItem) {
+        previousItem.classList.remove('selected');
+    }
+    const selectedItem = elements.thumbnailGrid.querySelector(`.thumbnail-item[data-path="${CSS.escape(imagePath)}"]`);
+    if (selectedItem) {
+        selectedItem.classList.add('selected');
     }
     
     // Load preview
@@ -700,9 +830,17 @@ function loadPreview(imagePath) {
     state.previewRotation = 0;
     
     const img = document.createElement('img');
+    img.decoding = 'async';
     img.src = getPreviewUrl(imagePath, 1024);
     img.alt = getFilename(imagePath);
     img.style.transform = 'rotate(0deg)';
+    // Once this preview is in, warm the neighbours' so stepping through the
+    // folder doesn't wait on preview generation for every image
+    img.addEventListener('load', () => {
+        if (state.selectedImage === imagePath) {
+            prefetchNeighbourPreviews(imagePath);
+        }
+    });
     
     // Insert before the controls
     elements.imagePreview.insertBefore(img, elements.previewControls);
@@ -717,6 +855,29 @@ function loadPreview(imagePath) {
     loadOverlayInfo(imagePath);
 }
 
+function prefetchNeighbourPreviews(imagePath) {
+    // Abort prefetches for the previous selection that are still in flight.
+    // Removing src rather than emptying it, which would request the page URL
+    for (const prefetch of state.previewPrefetches) {
+        prefetch.removeAttribute('src');
+    }
+    
+    const index = state.images.indexOf(imagePath);
+    if (index === -1) {
+        state.previewPrefetches = [];
+        return;
+    }
+    
+    // At most the next and previous image, to bound server work and memory
+    state.previewPrefetches = [index + 1, index - 1]
+        .filter(i => i >= 0 && i < state.images.length)
+        .map(i => {
+            const prefetch = new Image();
+            prefetch.src = getPreviewUrl(state.images[i], 1024);
+            return prefetch;
+        });
+}
+
 async function loadOverlayInfo(imagePath) {
     // Get or create overlay element
     let overlay = elements.imagePreview.querySelector('.preview-overlay');
@@ -911,7 +1072,7 @@ async function loadImageMetadata(imagePath) {
         renderTagList([]);
     }
     
-    updateSaveState();
+    state.hasUnsavedChanges = false;
 }
 
 async function handleMetadataTypeChange() {
@@ -929,7 +1090,7 @@ async function handleMetadataTypeChange() {
     // Always refresh thumbnail grid when type changes (to filter untagged)
     if (state.currentFolder) {
         state.page = 0;
-        await loadCurrentPage();
+        requestPageRefresh();
     }
 }
 
@@ -950,7 +1111,7 @@ async function handleTagTypeChange() {
     // Always refresh thumbnail grid when field changes (to filter untagged)
     if (state.currentFolder) {
         state.page = 0;
-        await loadCurrentPage();
+        requestPageRefresh();
     }
 }
 
@@ -961,17 +1122,19 @@ function renderTagList(tags) {
         return;
     }
     
-    elements.tagList.innerHTML = '';
-    
+    // Build the rows off-document and attach them in one go, so a rebuild
+    // costs a single layout/paint instead of one per tag
+    const fragment = document.createDocumentFragment();
     for (const tag of tags) {
-        const item = createTagElement(tag);
-        elements.tagList.appendChild(item);
+        fragment.appendChild(createTagElement(tag));
     }
+    elements.tagList.replaceChildren(fragment);
 }
 
 function createTagElement(tag) {
     const item = document.createElement('div');
     item.className = 'tag-item';
+    item.dataset.tag = tag;
     
     const text = document.createElement('span');
     text.textContent = tag;
@@ -979,7 +1142,6 @@ function createTagElement(tag) {
     const deleteBtn = document.createElement('button');
     deleteBtn.className = 'tag-delete';
     deleteBtn.textContent = '×';
-    deleteBtn.addEventListener('click', () => removeTag(tag));
     
     item.appendChild(text);
     item.appendChild(deleteBtn);
@@ -987,9 +1149,17 @@ function createTagElement(tag) {
     return item;
 }
 
-async function removeTag(tag) {
-    state.currentTags = state.currentTags.filter(t => t !== tag);
-    renderTagList(state.currentTags);
+async function removeTag(item) {
+    // Resolve the tag from the row at click time and drop only that row,
+    // instead of re-rendering every remaining tag
+    const index = state.currentTags.indexOf(item.dataset.tag);
+    if (index !== -1) {
+        state.currentTags.splice(index, 1);
+    }
+    item.remove();
+    if (state.currentTags.length === 0) {
+        renderTagList(state.currentTags);
+    }
     
     // Auto-save after removing tag
     await saveTagsImmediately();
@@ -1006,7 +1176,13 @@ async function handleAddTag() {
     }
     
     state.currentTags.push(value);
-    renderTagList(state.currentTags);
+    // Append just the new row - a full render is only needed to replace
+    // the empty-state placeholder
+    if (state.currentTags.length === 1) {
+        renderTagList(state.currentTags);
+    } else {
+        elements.tagList.appendChild(createTagElement(value));
+    }
     elements.tagInput.value = '';
     elements.tagSuggestions.classList.add('hidden');
     
@@ -1030,10 +1206,18 @@ async function handleTagInputChange() {
     }
     
     suggestionTimeout = setTimeout(async () => {
-        const result = await searchTags(query, state.tagType, 10);
+        // Over-fetch by the number of current tags so filtering them out
+        // below still leaves up to 10 suggestions
+        const result = await searchTags(query, state.tagType, 10 + state.currentTags.length);
+        
+        // Drop tags the image already has, ignoring case, in a single pass
+        const existingTags = new Set(state.currentTags.map(t => t.toLowerCase()));
+        const tags = result.data && result.data.tags
+            ? result.data.tags.filter(t => !existingTags.has(t.toLowerCase())).slice(0, 10)
+            : [];
         
-        if (result.data && result.data.tags && result.data.tags.length > 0) {
-            renderSuggestions(result.data.tags);
+        if (tags.length > 0) {
+            renderSuggestions(tags);
         } else {
             elements.tagSuggestions.classList.add('hidden');
         }
@@ -1058,88 +1242,142 @@ function renderSuggestions(tags) {
     elements.tagSuggestions.classList.remove('hidden');
 }
 
-// Save
-function updateSaveState() {
-    const sortedCurrent = [...state.currentTags].sort();
-    const sortedOriginal = [...state.originalTags].sort();
-    const tagsChanged = JSON.stringify(sortedCurrent) !== JSON.stringify(sortedOriginal);
-    state.hasUnsavedChanges = tagsChanged;
+// Show a save status message, optionally clearing it after clearAfterMs.
+// A single timer is reused so back-to-back saves don't pile up timers
+// that blank out a newer message early.
+function setSaveStatus(text, clearAfterMs = 0) {
+    if (state.saveStatusTimer) {
+        clearTimeout(state.saveStatusTimer);
+        state.saveStatusTimer = null;
+    }
+    elements.saveStatus.textContent = text;
+    if (clearAfterMs > 0) {
+        state.saveStatusTimer = setTimeout(() => {
+            state.saveStatusTimer = null;
+            elements.saveStatus.textContent = '';
+        }, clearAfterMs);
+    }
+}
+
+// True when two tag lists hold the same tags, in order
+function sameTags(a, b) {
+    return a.length === b.length && a.every((tag, i) => tag === b[i]);
 }
 
 async function saveTagsImmediately() {
     if (!state.selectedImage || !state.tagType) return;
     
-    elements.saveStatus.textContent = 'Saving...';
-    
-    const result = await updateMetadata(
-        state.selectedImage,
-        state.tagType,
-        state.metadataType,
-        state.currentTags
-    );
+    // Snapshot exactly what to write now: a save that has to wait behind one
+    // in flight still goes to this image and field, whatever is selected by
+    // the time it runs. A newer edit of the same image and field replaces a
+    // waiting one, so a burst of adds/removes costs at most two writes.
+    const key = [state.selectedImage, state.metadataType, state.tagType].join('\n');
+    const waiting = state.queuedSaves.get(key);
+    state.queuedSaves.set(key, {
+        imagePath: state.selectedImage,
+        metadataType: state.metadataType,
+        tagType: state.tagType,
+        tags: [...state.currentTags],
+        previousTags: waiting ? waiting.previousTags : state.originalTags,
+    });
     
-    if (result.data && result.data.success) {
-        state.originalTags = [...state.currentTags];
-        state.hasUnsavedChanges = false;
-        elements.saveStatus.textContent = 'Saved!';
-        setTimeout(() => {
-            elements.saveStatus.textContent = '';
-        }, 1500);
-        
-        // Refresh the image list to reflect tag changes
-        // (e.g., image may no longer match search criteria)
-        const prevImages = [...state.images];
-        const result2 = await getImages(
-            state.currentFolder,
-            state.page,
-            state.pageSize,
-            state.searchQuery || '',
-            elements.tagType ? elements.tagType.value : '',
-            state.metadataType || ''
-        );
-        if (result2.data) {
-            const newImages = result2.data.images;
-            // Only re-render thumbnails if the image list actually changed
-            if (JSON.stringify(prevImages) !== JSON.stringify(newImages)) {
-                state.images = newImages;
-                state.totalImages = result2.data.total_images;
-                state.totalPages = result2.data.total_pages;
-                updatePaginationControls();
-                renderThumbnails();
-            }
+    if (!state.saveInFlight) {
+        state.saveInFlight = runQueuedSaves();
+    }
+    await state.saveInFlight;
+}
+
+// Write queued snapshots one at a time until none are left
+async function runQueuedSaves() {
+    try {
+        while (state.queuedSaves.size > 0) {
+            const [key, save] = state.queuedSaves.entries().next().value;
+            state.queuedSaves.delete(key);
+            await writeQueuedSave(key, save);
         }
-    } else {
-        elements.saveStatus.textContent = `Error: ${result.error || 'Failed to save'}`;
+    } finally {
+        // Cleared in the same turn as the empty-queue check, so a save queued
+        // after it starts a new run instead of waiting on this finished one
+        state.saveInFlight = null;
     }
 }
 
-async function handleSave() {
-    if (!state.selectedImage || !state.tagType) return;
+async function writeQueuedSave(key, save) {
+    // Skip the metadata write and grid refresh when nothing changed
+    if (sameTags(save.tags, save.previousTags)) return;
     
-    elements.saveStatus.textContent = 'Saving...';
+    const isSelected = () =>
+        state.selectedImage === save.imagePath &&
+        state.metadataType === save.metadataType &&
+        state.tagType === save.tagType;
     
-    const result = await updateMetadata(
-        state.selectedImage,
-        state.tagType,
-        state.metadataType,
-        state.currentTags
-    );
+    setSaveStatus('Saving...');
+    const result = await updateMetadata(save.imagePath, save.tagType, save.metadataType, save.tags);
     
-    if (result.data && result.data.success) {
-        state.originalTags = [...state.currentTags];
-        state.hasUnsavedChanges = false;
-        elements.saveStatus.textContent = 'Saved!';
-        setTimeout(() => {
-            elements.saveStatus.textContent = '';
-        }, 2000);
-    } else {
-        elements.saveStatus.textContent = `Error: ${result.error || 'Failed to save'}`;
+    if (!(result.data && result.data.success)) {
+        setSaveStatus(`Error: ${result.error || 'Failed to save'}`);
+        if (isSelected()) {
+            state.hasUnsavedChanges = true;
+        }
+        return;
+    }
+    setSaveStatus('Saved!', 1500);
+    
+    // A follow-up edit of the same image and field now starts from these tags
+    const waiting = state.queuedSaves.get(key);
+    if (waiting) {
+        waiting.previousTags = save.tags;
     }
+    
+    // The user may have moved to another image or field meanwhile
+    if (!isSelected()) return;
+    state.originalTags = save.tags;
+    state.hasUnsavedChanges = !sameTags(state.currentTags, state.originalTags);
+    
+    // Refresh the image list only if the save changed whether this image
+    // passes the grid filter - otherwise the page would come back the same
+    if (tagsMatchGridFilter(save.previousTags) !== tagsMatchGridFilter(save.tags)) {
+        requestPageRefresh();
+    }
+}
+
+// Whether an image with these tags in the current field is listed in the
+// grid: with a search, every word must match some tag the way the backend's
+// `tag LIKE '%word%'` does; without one, only untagged images are listed
+function tagsMatchGridFilter(tags) {
+    const words = state.searchQuery.split(/\s+/).filter(Boolean);
+    if (words.length === 0) {
+        return tags.length === 0;
+    }
+    const folded = tags.map(foldAsciiCase);
+    return words.every(word => {
+        const pattern = likeContainsPattern(word);
+        return folded.some(tag => pattern.test(tag));
+    });
+}
+
+// SQLite's LIKE folds case for ASCII letters only
+function foldAsciiCase(text) {
+    return text.replace(/[A-Z]/g, c => c.toLowerCase());
+}
+
+// A regex matching what `LIKE '%word%'` matches: % is any run of characters
+// and _ any single character (there is no ESCAPE clause)
+function likeContainsPattern(word) {
+    const body = foldAsciiCase(word)
+        .replace(/[.*+?^${}()|[\]\\\/]/g, '\\$&')
+        .replace(/%/g, '[\\s\\S]*')
+        .replace(/_/g, '[\\s\\S]');
+    return new RegExp(body, 'u');
 }
 
 // Search
 async function handleSearch() {
-    state.searchQuery = elements.searchInput.value.trim();
+    await runSearch(elements.searchInput.value.trim());
+}
+
+async function runSearch(query) {
+    state.searchQuery = query;
     state.page = 0;
     await loadCurrentPage();
 }
@@ -1195,6 +1433,16 @@ function setupResizeHandles() {
         let isResizingH = false;
         let startX = 0;
         let startWidthRight = 0;
+        // Width waiting for the next animation frame - mousemove can fire
+        // several times per frame, but only the last position is drawn
+        let pendingWidth = null;
+        
+        const applyWidth = () => {
+            if (pendingWidth === null) return;
+            elements.panelRight.style.width = `${pendingWidth}px`;
+            elements.panelRight.style.flex = 'none';
+            pendingWidth = null;
+        };
         
         elements.resizeHandleH.addEventListener('mousedown', (e) => {
             isResizingH = true;
@@ -1210,13 +1458,16 @@ function setupResizeHandles() {
             
             const deltaX = startX - e.clientX;
             const newWidth = Math.max(300, Math.min(startWidthRight + deltaX, window.innerWidth - 400));
-            elements.panelRight.style.width = `${newWidth}px`;
-            elements.panelRight.style.flex = 'none';
+            if (pendingWidth === null) {
+                requestAnimationFrame(applyWidth);
+            }
+            pendingWidth = newWidth;
         });
         
         document.addEventListener('mouseup', () => {
             if (isResizingH) {
                 isResizingH = false;
+                applyWidth();  // Don't lose a move still waiting for its frame
                 document.body.classList.remove('resizing');
                 elements.resizeHandleH.classList.remove('active');
                 saveLayoutPreferences();
@@ -1229,11 +1480,23 @@ function setupResizeHandles() {
         let isResizingV = false;
         let startY = 0;
         let startHeightPreview = 0;
+        let maxHeightPreview = 0;
+        let pendingHeight = null;  // As pendingWidth above
+        
+        const applyHeight = () => {
+            if (pendingHeight === null) return;
+            elements.previewContainer.style.height = `${pendingHeight}px`;
+            elements.previewContainer.style.flex = 'none';
+            pendingHeight = null;
+        };
         
         elements.resizeHandleV.addEventListener('mousedown', (e) => {
             isResizingV = true;
             startY = e.clientY;
             startHeightPreview = elements.previewContainer.offsetHeight;
+            // The panel's height doesn't change during the drag, so measure
+            // it once here rather than forcing a layout on every mousemove
+            maxHeightPreview = elements.panelRight.offsetHeight - 200;
             document.body.classList.add('resizing-v');
             elements.resizeHandleV.classList.add('active');
             e.preventDefault();
@@ -1243,15 +1506,17 @@ function setupResizeHandles() {
             if (!isResizingV) return;
             
             const deltaY = e.clientY - startY;
-            const panelHeight = elements.panelRight.offsetHeight;
-            const newHeight = Math.max(150, Math.min(startHeightPreview + deltaY, panelHeight - 200));
-            elements.previewContainer.style.height = `${newHeight}px`;
-            elements.previewContainer.style.flex = 'none';
+            const newHeight = Math.max(150, Math.min(startHeightPreview + deltaY, maxHeightPreview));
+            if (pendingHeight === null) {
+                requestAnimationFrame(applyHeight);
+            }
+            pendingHeight = newHeight;
         });
         
         document.addEventListener('mouseup', () => {
             if (isResizingV) {
                 isResizingV = false;
+                applyHeight();
                 document.body.classList.remove('resizing-v');
                 elements.resizeHandleV.classList.remove('active');
                 saveLayoutPreferences();
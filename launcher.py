@@ -33,8 +33,10 @@ def find_free_port(start_port=8080, max_attempts=100):
 
 def wait_for_server(port, timeout=30):
     """Wait for server to be ready."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    # Compute the deadline once on the monotonic clock (immune to wall-clock
+    # adjustments) and compare against it each attempt
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 s.settimeout(1)
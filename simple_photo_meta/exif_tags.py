@@ -248,4 +248,5 @@ exif_writable_tags = [
 ]
 
 exif_writable_fields_list = [t["tag"] for t in exif_writable_tags]
+exif_writable_tags_by_tag = {t["tag"]: t for t in exif_writable_tags}
 
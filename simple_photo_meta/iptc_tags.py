@@ -128,3 +128,4 @@ iptc_writable_tags = [
 ]
 
 iptc_writabable_fields_list = [t["tag"] for t in iptc_writable_tags]
+iptc_writable_tags_by_tag = {t["tag"]: t for t in iptc_writable_tags}